@@ -0,0 +1,59 @@
+'''
+Startup benchmark for the headless chess package. Imports the package in fresh interpreters (like a new worker
+process would) and reports how long the import takes. Also checks that pygame isn't pulled in by the import
+or by a star import.
+
+Run from the repository root: python benchmarks/bench_startup.py [runs]
+'''
+
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+#prints the time spent importing chess and whether pygame got loaded along with it
+IMPORT_SCRIPT = '''
+import sys, time
+start = time.perf_counter()
+import chess
+print(time.perf_counter() - start, 'pygame' in sys.modules)
+'''
+STAR_IMPORT_SCRIPT = '''
+import sys
+from chess import *
+print('pygame' in sys.modules)
+'''
+
+
+def time_import(runs):
+    import_times = []
+    process_times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        output = subprocess.run([sys.executable, '-c', IMPORT_SCRIPT], cwd=ROOT, capture_output=True, text=True, check=True).stdout
+        process_times.append(time.perf_counter() - start)
+        import_time, pygame_loaded = output.split()
+        if pygame_loaded == 'True':
+            raise RuntimeError('importing chess loaded pygame')
+        import_times.append(float(import_time))
+    return import_times, process_times
+
+
+def check_star_import():
+    output = subprocess.run([sys.executable, '-c', STAR_IMPORT_SCRIPT], cwd=ROOT, capture_output=True, text=True, check=True).stdout
+    if output.strip() == 'True':
+        raise RuntimeError('from chess import * loaded pygame')
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    check_star_import()
+    import_times, process_times = time_import(runs)
+    print(f'import chess:      median {statistics.median(import_times)*1000:.2f} ms  min {min(import_times)*1000:.2f} ms  ({runs} runs)')
+    print(f'interpreter total: median {statistics.median(process_times)*1000:.2f} ms  min {min(process_times)*1000:.2f} ms')
+
+
+if __name__ == '__main__':
+    main()
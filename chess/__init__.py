@@ -0,0 +1,21 @@
+'''
+Chess package. Importing it only loads the rules engine, which has no third party dependencies.
+Optional subsystems like the pygame front end (chess_main) are imported the first time they are accessed,
+so headless users and worker processes never pay for pygame.
+'''
+
+import importlib
+
+from .chess_engine import GameState, Move, Castle_Rights, Position_Snapshot
+
+__all__ = ['GameState', 'Move', 'Castle_Rights', 'Position_Snapshot'] #lazy modules are left out so import * stays headless
+
+_lazy_modules = ('chess_main',) #optional subsystems loaded on first access
+
+
+def __getattr__(name):
+    if name in _lazy_modules:
+        module = importlib.import_module(f'.{name}', __name__)
+        globals()[name] = module #cache so __getattr__ isn't hit again
+        return module
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
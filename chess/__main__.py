@@ -0,0 +1,7 @@
+'''
+Runs the pygame front end with python -m chess
+'''
+
+from .chess_main import main
+
+main()
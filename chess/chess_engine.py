@@ -2,7 +2,11 @@
 This class is responsible for storing all the information about the current state of a chess game. It will also be responsible for determining the valid moves at the current state. It will also keep a move Log.
 '''
 
+from collections import namedtuple
+
 class GameState():
+    piece_values = {'P': 1, 'N': 3, 'B': 3, 'R': 5, 'Q': 9, 'K': 100} #material values used by static exchange evaluation
+
     def __init__(self):
     #board is an 8x8 2d list, each element of the list has 2 characters.
     #The first character represents the color of the piece, 'b' or 'w'
@@ -27,8 +31,7 @@ class GameState():
         self.stalemate = False
         self.enpassant_possible = () #coordinates to square where en-passant is possible 
         self.current_castling_rights = Castle_Rights(True, True, True, True)
-        self.castle_rights_log = [Castle_Rights(self.current_castling_rights.wks, self.current_castling_rights.bks, 
-                                                self.current_castling_rights.wqs, self.current_castling_rights.bqs)]
+        self.castle_rights_log = [self.current_castling_rights.as_tuple()] #immutable tuples so snapshots can share them
 
 
     '''
@@ -72,24 +75,24 @@ class GameState():
 
         #update castling rights - when rook or king moves for the first time
         self.update_castle_rights(move)
-        self.castle_rights_log.append(Castle_Rights(self.current_castling_rights.wks, self.current_castling_rights.bks, 
-                                                self.current_castling_rights.wqs, self.current_castling_rights.bqs))
+        self.castle_rights_log.append(self.current_castling_rights.as_tuple())
 
 
     '''
     Undo the last move made
     '''
     def undo_move(self):
-        if len(self.move_log) != 0: #makes sure a move has been made
-            move = self.move_log.pop() #pops the prev move off the move log
-            self.board[move.start_row][move.start_column] = move.piece_moved #resets piece captured
-            self.board[move.end_row][move.end_column] = move.piece_captured #brings moved piece back to start
-            self.white_to_move = not self.white_to_move #resets turn to correct player
-            #update king location
-            if move.piece_moved == 'wK':
-                self.white_king_location = ( move.start_row,  move.start_column)
-            elif move.piece_moved == 'bK':
-                self.black_king_location = ( move.start_row,  move.start_column)
+        if len(self.move_log) == 0: #no move to undo (e.g. a new game or a state restored from a position-only snapshot)
+            return
+        move = self.move_log.pop() #pops the prev move off the move log
+        self.board[move.start_row][move.start_column] = move.piece_moved #resets piece captured
+        self.board[move.end_row][move.end_column] = move.piece_captured #brings moved piece back to start
+        self.white_to_move = not self.white_to_move #resets turn to correct player
+        #update king location
+        if move.piece_moved == 'wK':
+            self.white_king_location = ( move.start_row,  move.start_column)
+        elif move.piece_moved == 'bK':
+            self.black_king_location = ( move.start_row,  move.start_column)
         self.checkmate = False #updating values incase player undos a checkmate or stalemate
         self.stalemate = False
         #undo enpassant
@@ -102,8 +105,7 @@ class GameState():
             self.enpassant_possible = ()
         #undo castle rights
         self.castle_rights_log.pop() #get rid of new castle rights from prev move
-        new_rights = self.castle_rights_log[-1] #set castle rights back to prev state
-        self.current_castling_rights =  Castle_Rights(new_rights.wks, new_rights.bks, new_rights.wqs, new_rights.bqs)
+        self.current_castling_rights = Castle_Rights(*self.castle_rights_log[-1]) #set castle rights back to prev state
         #undo castle move
         if move.is_castle_move:
             if move.end_column - move.start_column == 2:
@@ -112,6 +114,53 @@ class GameState():
             else:  #queen side
                 self.board[move.end_row][move.end_column-2] = self.board[move.end_row][move.end_column+1]
                 self.board[move.end_row][move.end_column+1] = '--'
+
+
+    '''
+    Takes an immutable, hashable and picklable snapshot of the current position that can be restored later or sent to
+    another process. By default only the position is stored, so the snapshot is small, constant size and restored
+    in microseconds, but undo_move does nothing for moves made before it. With include_history=True the move log is
+    also stored as plain tuples (see Move.as_tuple) so those moves can be undone, at a cost that grows with the game.
+    '''
+    def snapshot(self, include_history=False):
+        castling_rights = self.current_castling_rights.as_tuple()
+        if include_history:
+            move_log = tuple([move.as_tuple() for move in self.move_log])
+            castle_rights_log = tuple(self.castle_rights_log)
+        else:
+            move_log = ()
+            castle_rights_log = (castling_rights,)
+        return Position_Snapshot(tuple(map(tuple, self.board)), self.white_to_move, self.white_king_location,
+                                 self.black_king_location, self.checkmate, self.stalemate, self.enpassant_possible,
+                                 castling_rights, move_log, castle_rights_log)
+
+
+    '''
+    Sets the game state back to the position stored in a snapshot
+    '''
+    def restore(self, snapshot):
+        self.board = list(map(list, snapshot.board))
+        self.white_to_move = snapshot.white_to_move
+        self.white_king_location = snapshot.white_king_location
+        self.black_king_location = snapshot.black_king_location
+        self.checkmate = snapshot.checkmate
+        self.stalemate = snapshot.stalemate
+        self.enpassant_possible = snapshot.enpassant_possible
+        self.current_castling_rights = Castle_Rights(*snapshot.castling_rights)
+        self.move_log = [Move.from_tuple(move_tuple) for move_tuple in snapshot.move_log]
+        self.castle_rights_log = list(snapshot.castle_rights_log)
+
+
+    '''
+    Creates a new GameState from a snapshot (e.g. one received by a worker process)
+    '''
+    @classmethod
+    def from_snapshot(cls, snapshot):
+        gs = cls()
+        gs.restore(snapshot)
+        return gs
+
+
     '''
     Update the castle rights for each move
     '''
@@ -152,8 +201,7 @@ class GameState():
     '''
     def get_legal_moves(self):
         temp_enpassant_possible = self.enpassant_possible #save enpassant state before checking moves
-        temp_castle_rights = Castle_Rights(self.current_castling_rights.wks, self.current_castling_rights.bks, #copy current castle rights
-                                                self.current_castling_rights.wqs, self.current_castling_rights.bqs)
+        temp_castle_rights = Castle_Rights(*self.current_castling_rights.as_tuple()) #copy current castle rights
         #generate all possible moves
         moves = self.get_possible_moves()
         if self.white_to_move:
@@ -206,6 +254,86 @@ class GameState():
         return False
 
 
+    '''
+    Static exchange evaluation. Resolves the full capture sequence on the end square of move and returns the net
+    material outcome for the player making it (in pawns) without calling make_move. Both sides always recapture with
+    their least valuable attacker and can stop capturing whenever continuing would lose material.
+    A negative result means the capture loses material and can be dropped by search and move ordering.
+    Promotions that don't capture are also evaluated, since the new queen can be lost on a defended square.
+    '''
+    def static_exchange_evaluation(self, move):
+        if move.is_castle_move or (move.piece_captured == '--' and not move.is_pawn_promotion):
+            return 0 #nothing is captured or promoted so there is no exchange to resolve
+        row, column = move.end_row, move.end_column
+        removed = {(move.start_row, move.start_column)} #squares whose pieces have already been traded off. treated as empty
+        if move.is_enpassant:
+            removed.add((move.start_row, move.end_column)) #captured pawn is not on the end square
+        gain = [0 if move.piece_captured == '--' else self.piece_values[move.piece_captured[1]]] #gain[d] = material won by the side capturing at depth d
+        if move.is_pawn_promotion:
+            attacker_value = self.piece_values['Q'] #auto promotes to a queen
+            gain[0] += self.piece_values['Q'] - self.piece_values['P']
+        else:
+            attacker_value = self.piece_values[move.piece_moved[1]] #value of the piece now standing on the target square
+        color = 'b' if move.piece_moved[0] == 'w' else 'w'
+        while True:
+            attacker = self.get_least_valuable_attacker(row, column, color, removed)
+            if attacker is None:
+                break
+            if attacker[0] == 'K' and self.get_least_valuable_attacker(row, column, 'b' if color == 'w' else 'w',
+                                                                         removed | {attacker[1]}) is not None:
+                break #king can't recapture onto a square that is still defended
+            if attacker[0] == 'P' and (row == 0 or row == 7): #pawn recapturing onto the back rank promotes to a queen
+                gain.append(attacker_value + self.piece_values['Q'] - self.piece_values['P'] - gain[-1])
+                attacker_value = self.piece_values['Q']
+            else:
+                gain.append(attacker_value - gain[-1]) #speculative gain if the recapture is made
+                attacker_value = self.piece_values[attacker[0]]
+            removed.add(attacker[1]) #removing the attacker uncovers any x-ray attackers behind it
+            color = 'b' if color == 'w' else 'w'
+        for depth in range(len(gain)-1, 0, -1): #each side only continues the exchange if it doesn't lose material
+            gain[depth-1] = -max(-gain[depth-1], gain[depth])
+        return gain[0]
+
+
+    '''
+    Finds the least valuable piece of the given color attacking square row, column. Pieces on removed squares
+    are ignored and sliders can see through them, which picks up x-ray attackers stacked behind each other.
+    Returns (piece type, (row, column)) or None if the square is not attacked by that color.
+    '''
+    def get_least_valuable_attacker(self, row, column, color, removed):
+        pawn_row = row + 1 if color == 'w' else row - 1 #row pawns of this color attack the square from
+        for c in (column-1, column+1):
+            if 0 <= pawn_row <= 7 and 0 <= c <= 7 and (pawn_row, c) not in removed and self.board[pawn_row][c] == color + 'P':
+                return 'P', (pawn_row, c)
+
+        for r, c in ((row-2, column-1), (row-1, column-2), (row-2, column+1), (row-1, column+2),
+                     (row+2, column-1), (row+1, column-2), (row+2, column+1), (row+1, column+2)):
+            if 0 <= r <= 7 and 0 <= c <= 7 and (r, c) not in removed and self.board[r][c] == color + 'N':
+                return 'N', (r, c)
+
+        sliders = [] #first piece found along each ray
+        for directions, piece_types in ((((1, 1), (-1, -1), (-1, 1), (1, -1)), 'BQ'), (((1, 0), (0, 1), (-1, 0), (0, -1)), 'RQ')):
+            for direction in directions:
+                r, c = row + direction[0], column + direction[1]
+                while 0 <= r <= 7 and 0 <= c <= 7:
+                    if (r, c) not in removed and self.board[r][c] != '--':
+                        if self.board[r][c][0] == color and self.board[r][c][1] in piece_types:
+                            sliders.append((self.board[r][c][1], (r, c)))
+                        break #ray is blocked by the first piece on it
+                    r += direction[0]
+                    c += direction[1]
+        for piece_type in 'BRQ':
+            for slider in sliders:
+                if slider[0] == piece_type:
+                    return slider
+
+        for r in range(row-1, row+2):
+            for c in range(column-1, column+2):
+                if 0 <= r <= 7 and 0 <= c <= 7 and (r, c) not in removed and self.board[r][c] == color + 'K':
+                    return 'K', (r, c)
+        return None
+
+
 
 
     '''
@@ -427,7 +555,7 @@ class Move():
         self.piece_moved = board[self.start_row][self.start_column]
         self.piece_captured = board[self.end_row][self.end_column]
         #keeps track of pawn promotion moves to help with undos
-        self.is_pawn_promotion = (self.piece_moved == ('wP' and self.end_row == 0) or (self.piece_moved == 'bP' and self.end_row == 7))
+        self.is_pawn_promotion = ((self.piece_moved == 'wP' and self.end_row == 0) or (self.piece_moved == 'bP' and self.end_row == 7))
         #keeps track of en passant moves to help with undos
         self.is_enpassant = is_enpassant
         if self.is_enpassant:
@@ -456,6 +584,21 @@ class Move():
         return self.columns_to_files[c] + self.rows_to_ranks[r]
 
 
+    def as_tuple(self): #immutable copy of the move used by GameState.snapshot, turned back into a Move with from_tuple
+        return (self.start_row, self.start_column, self.end_row, self.end_column,
+                self.piece_moved, self.piece_captured, self.is_enpassant, self.is_castle_move)
+
+
+    @classmethod
+    def from_tuple(cls, move_tuple): #rebuilds a move from as_tuple without needing the board it was made on
+        move = cls.__new__(cls)
+        (move.start_row, move.start_column, move.end_row, move.end_column,
+         move.piece_moved, move.piece_captured, move.is_enpassant, move.is_castle_move) = move_tuple
+        move.is_pawn_promotion = (move.piece_moved == 'wP' and move.end_row == 0) or (move.piece_moved == 'bP' and move.end_row == 7)
+        move.move_id = (move.start_row * 1000) + (move.start_column * 100) + (move.end_row * 10) + (move.end_column)
+        return move
+
+
 
 class Castle_Rights():
     
@@ -465,6 +608,19 @@ class Castle_Rights():
         self.wqs = wqs
         self.bqs = bqs
 
+    def as_tuple(self): #immutable copy of the rights in constructor order, used by the castle rights log and snapshots
+        return (self.wks, self.bks, self.wqs, self.bqs)
+
+
+
+'''
+Immutable copy of a GameState position. It only holds tuples, strings and bools, so it is hashable, safe to share
+between threads and cheap to pickle for worker processes. Created with GameState.snapshot() and applied with GameState.restore().
+'''
+Position_Snapshot = namedtuple('Position_Snapshot', ['board', 'white_to_move', 'white_king_location', 'black_king_location',
+                                                     'checkmate', 'stalemate', 'enpassant_possible', 'castling_rights',
+                                                     'move_log', 'castle_rights_log'])
+
 
 
 
@@ -3,8 +3,12 @@ This is the main driver file. It will be responsible for handling user input and
 current GameState object.
 '''
 
+import os
 import pygame as p
-import chess_engine
+if __package__:
+    from . import chess_engine
+else: #run directly as a script instead of through the chess package
+    import chess_engine
 
 #GLOBAL VARIABLES
 
@@ -13,6 +17,7 @@ DIMENSION = 8 #chess board is 8x8
 SQ_SIZE = HEIGHT // DIMENSION 
 MAX_FPS = 15 #for animations
 IMAGES = {}
+IMAGE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'images') #images are found relative to the package, not the working directory
 
 
 '''
@@ -26,7 +31,7 @@ def load_images():
     #loads all images of pieces and assigns them to a dictionary. #key = piece name | value = png
     #images are transformed to SQ_SIZE X SQ_SIZE
     for piece in pieces: 
-        IMAGES[piece] = p.transform.scale(p.image.load(f"chess/images/{piece}.png"), (SQ_SIZE, SQ_SIZE)) 
+        IMAGES[piece] = p.transform.scale(p.image.load(os.path.join(IMAGE_DIR, f"{piece}.png")), (SQ_SIZE, SQ_SIZE)) 
 
 
 
@@ -0,0 +1,76 @@
+'''
+Tests for GameState.snapshot, GameState.restore and GameState.from_snapshot
+'''
+
+import pickle
+
+from chess import GameState
+
+
+def play(gs, move_names): #makes moves given in chess notation, e.g. 'e2e4'
+    for name in move_names:
+        gs.make_move([move for move in gs.get_legal_moves() if move.get_chess_notation() == name][0])
+
+
+def test_pickle_round_trip_then_undo():
+    gs = GameState()
+    play(gs, ['e2e4', 'e7e5'])
+    earlier_board = [row[:] for row in gs.board]
+    earlier_rights = gs.current_castling_rights.as_tuple()
+    play(gs, ['e1e2', 'e8e7']) #king moves take away castling rights
+    snapshot = pickle.loads(pickle.dumps(gs.snapshot(include_history=True)))
+    assert hash(snapshot) == hash(gs.snapshot(include_history=True))
+
+    restored = GameState.from_snapshot(snapshot)
+    assert restored.board == gs.board
+    assert restored.current_castling_rights.as_tuple() == (False, False, False, False)
+    restored.undo_move()
+    restored.undo_move()
+    assert restored.board == earlier_board
+    assert restored.current_castling_rights.as_tuple() == earlier_rights
+    assert restored.white_king_location == (7, 4) and restored.black_king_location == (0, 4)
+
+
+def test_restore_does_not_alias_snapshot():
+    gs = GameState()
+    play(gs, ['e2e4'])
+    snapshot = gs.snapshot(include_history=True)
+    gs.restore(snapshot)
+    play(gs, ['e7e5'])
+    gs.current_castling_rights.wks = False
+    assert snapshot.board[1][4] == 'bP' and snapshot.board[3][4] == '--'
+    assert len(snapshot.move_log) == 1
+    assert snapshot.castling_rights == (True, True, True, True)
+    gs.restore(snapshot)
+    assert gs.board[1][4] == 'bP'
+    assert all(row is not snapshot_row for row, snapshot_row in zip(gs.board, snapshot.board))
+
+
+def test_snapshot_without_history():
+    gs = GameState()
+    play(gs, ['e2e4', 'e7e5'])
+    snapshot = gs.snapshot()
+    assert snapshot.move_log == ()
+    restored = GameState.from_snapshot(snapshot)
+    assert restored.board == gs.board
+    assert restored.enpassant_possible == gs.enpassant_possible
+    assert [move.get_chess_notation() for move in restored.get_legal_moves()] == \
+           [move.get_chess_notation() for move in gs.get_legal_moves()]
+
+
+def test_undo_after_position_only_restore_does_nothing():
+    gs = GameState()
+    play(gs, ['e2e4', 'e7e5'])
+    restored = GameState.from_snapshot(gs.snapshot())
+    restored.undo_move()
+    assert restored.board == gs.board
+    assert restored.white_to_move == gs.white_to_move
+    assert restored.current_castling_rights.as_tuple() == gs.current_castling_rights.as_tuple()
+
+
+def test_restored_moves_match_original():
+    gs = GameState()
+    play(gs, ['e2e4', 'd7d5', 'e4d5'])
+    restored = GameState.from_snapshot(gs.snapshot(include_history=True))
+    for move, restored_move in zip(gs.move_log, restored.move_log):
+        assert vars(move) == vars(restored_move)
@@ -0,0 +1,94 @@
+'''
+Tests for GameState.static_exchange_evaluation. Positions are built on an empty board so each test only has the
+pieces involved in the exchange.
+'''
+
+from chess import GameState, Move
+
+
+def make_game_state(pieces, white_to_move=True, enpassant_possible=()):
+    gs = GameState()
+    gs.board = [['--'] * 8 for _ in range(8)]
+    for (row, column), piece in pieces.items():
+        gs.board[row][column] = piece
+    gs.white_to_move = white_to_move
+    gs.enpassant_possible = enpassant_possible
+    return gs
+
+
+def see(gs, start_sq, end_sq, **kwargs):
+    return gs.static_exchange_evaluation(Move(start_sq, end_sq, gs.board, **kwargs))
+
+
+def test_undefended_capture():
+    gs = make_game_state({(4, 3): 'wP', (3, 4): 'bQ'})
+    assert see(gs, (4, 3), (3, 4)) == 9
+
+
+def test_capture_defended_by_pawn():
+    gs = make_game_state({(7, 3): 'wR', (3, 3): 'bP', (2, 4): 'bP'})
+    assert see(gs, (7, 3), (3, 3)) == 1 - 5
+
+
+def test_rook_battery_xray():
+    #second white rook recaptures through the first one after it is traded off
+    gs = make_game_state({(7, 3): 'wR', (6, 3): 'wR', (3, 3): 'bR', (0, 3): 'bR'})
+    assert see(gs, (6, 3), (3, 3)) == 5
+
+
+def test_queen_with_bishop_xray_behind():
+    #QxN, PxQ and the bishop behind the queen takes the pawn back. black stops after NxQ is already losing for white
+    gs = make_game_state({(5, 2): 'wQ', (6, 1): 'wB', (2, 5): 'bN', (1, 6): 'bP'})
+    assert see(gs, (5, 2), (2, 5)) == 3 - 9 + 1
+    #without the bishop the pawn recapture stands
+    gs = make_game_state({(5, 2): 'wQ', (2, 5): 'bN', (1, 6): 'bP'})
+    assert see(gs, (5, 2), (2, 5)) == 3 - 9
+
+
+def test_king_recapture_blocked_by_xray_defender():
+    #RxP next to the black king. the king can't take back because the second rook defends through the first
+    gs = make_game_state({(7, 3): 'wR', (6, 3): 'wR', (1, 3): 'bP', (0, 4): 'bK'})
+    assert see(gs, (6, 3), (1, 3)) == 1
+    #with a single rook the king recaptures
+    gs = make_game_state({(6, 3): 'wR', (1, 3): 'bP', (0, 4): 'bK'})
+    assert see(gs, (6, 3), (1, 3)) == 1 - 5
+
+
+def test_enpassant():
+    gs = make_game_state({(3, 4): 'wP', (3, 3): 'bP', (1, 2): 'bP'}, enpassant_possible=(2, 3))
+    move = [m for m in gs.get_possible_moves() if m.is_enpassant][0]
+    assert gs.static_exchange_evaluation(move) == 1 - 1
+    #removing the captured pawn opens the rank for the rook behind it
+    gs = make_game_state({(3, 4): 'wP', (3, 3): 'bP', (3, 0): 'bR', (3, 7): 'wR'}, enpassant_possible=(2, 3))
+    assert see(gs, (3, 4), (2, 3), is_enpassant=True) == 1
+
+
+def test_white_promotion_capture():
+    gs = make_game_state({(1, 6): 'wP', (0, 7): 'bR'})
+    assert see(gs, (1, 6), (0, 7)) == 5 + 9 - 1
+
+
+def test_black_promotion_capture():
+    gs = make_game_state({(6, 6): 'bP', (7, 7): 'wR'}, white_to_move=False)
+    assert see(gs, (6, 6), (7, 7)) == 5 + 9 - 1
+
+
+def test_quiet_promotion():
+    #a8=Q is lost to the rook on b8, so white only loses the pawn
+    gs = make_game_state({(1, 0): 'wP', (0, 1): 'bR'})
+    assert see(gs, (1, 0), (0, 0)) == -1
+    gs = make_game_state({(1, 0): 'wP'})
+    assert see(gs, (1, 0), (0, 0)) == 9 - 1
+    gs = make_game_state({(6, 7): 'bP'}, white_to_move=False)
+    assert see(gs, (6, 7), (7, 7)) == 9 - 1
+
+
+def test_quiet_move_is_zero():
+    gs = make_game_state({(6, 4): 'wP', (3, 3): 'bP'})
+    assert see(gs, (6, 4), (4, 4)) == 0
+
+
+def test_pawn_recapture_promotes():
+    #RxR on the back rank, then a pawn takes back and promotes
+    gs = make_game_state({(0, 0): 'wR', (0, 5): 'bR', (1, 1): 'wP'}, white_to_move=False)
+    assert see(gs, (0, 5), (0, 0)) == 5 - 5 - 9 + 1